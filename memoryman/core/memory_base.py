@@ -3,13 +3,20 @@ Base classes for memory implementations
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
 from datetime import datetime
+from memoryman.core.retrieval import SimpleRetriever
 
 
 class Memory(ABC):
     """Abstract base class for all memory types"""
 
+    __slots__ = ("memory_id", "storage", "created_at")
+
+    # Fields used for text search (None = all string fields)
+    search_fields: Optional[List[str]] = None
+
     def __init__(self, memory_id: str, storage_engine):
         """
         Initialize memory
@@ -27,13 +34,33 @@ class Memory(ABC):
         """Store data in memory"""
         pass
 
+    def _add_metadata(
+        self, key: str, data: Dict[str, Any], now: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Fill in metadata defaults before data is stored
+
+        now is the ISO timestamp to use for missing timestamps, so bulk
+        writes can format the current time once (default: datetime.now())
+        """
+        return data
+
+    def store_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """Store several key -> data items in one storage write"""
+        # One timestamp for the whole batch instead of one per item
+        now = datetime.now().isoformat()
+        self.storage.store_many(
+            self.memory_id,
+            {key: self._add_metadata(key, data, now) for key, data in items.items()},
+        )
+
     @abstractmethod
     def retrieve(self, key: str) -> Optional[Dict[str, Any]]:
         """Retrieve data from memory"""
         pass
 
     @abstractmethod
-    def query(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+    def query(self, query: str, limit: Optional[int] = None, **kwargs) -> List[Dict[str, Any]]:
         """Query memory with custom logic"""
         pass
 
@@ -42,6 +69,10 @@ class Memory(ABC):
         """Delete data from memory"""
         pass
 
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Full-text search, most relevant items first"""
+        return self.storage.search(self.memory_id, query, limit, self.search_fields)
+
     @abstractmethod
     def clear(self) -> None:
         """Clear all data from memory"""
@@ -51,9 +82,13 @@ class Memory(ABC):
         """List all keys in this memory"""
         return self.storage.list_keys(self.memory_id)
 
+    def iter_keys(self) -> Iterator[str]:
+        """Iterate over the keys in this memory without building a list"""
+        return self.storage.iter_keys(self.memory_id)
+
     def count(self) -> int:
         """Count total items in memory"""
-        return len(self.list_keys())
+        return self.storage.count(self.memory_id)
 
 
 class StorageEngine(ABC):
@@ -64,16 +99,99 @@ class StorageEngine(ABC):
         """Store data with memory_id:key"""
         pass
 
+    def store_many(self, memory_id: str, items: Dict[str, Dict[str, Any]]) -> None:
+        """Store several key -> data items at once"""
+        for key, data in items.items():
+            self.store(memory_id, key, data)
+
+    @contextmanager
+    def batch(self):
+        """Group writes into one transaction (backends may override)"""
+        yield
+
     @abstractmethod
     def retrieve(self, memory_id: str, key: str) -> Optional[Dict[str, Any]]:
         """Retrieve data by memory_id:key"""
         pass
 
     @abstractmethod
-    def query(self, memory_id: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Query data in a memory"""
+    def query(
+        self,
+        memory_id: str,
+        filters: Dict[str, Any],
+        limit: Optional[int] = None,
+        order_by: Optional[str] = None,
+        reverse: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Query data in a memory, optionally sorted, returning at most limit items"""
         pass
 
+    def search(
+        self,
+        memory_id: str,
+        query: str,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Text search in a memory (backends may override with an index)"""
+        results = SimpleRetriever.search_text(self.query(memory_id, {}), query, fields)
+        return results if limit is None else results[:limit]
+
+    def iter_rows(self, memory_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over every item in a memory"""
+        return iter(self.get_all(memory_id))
+
+    def search_many(
+        self,
+        query: str,
+        targets: Dict[str, Optional[List[str]]],
+        limit: Optional[int] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Search several memories, given as memory_id -> search fields"""
+        return {
+            memory_id: self.search(memory_id, query, limit, fields)
+            for memory_id, fields in targets.items()
+        }
+
+    def get_all(
+        self,
+        memory_id: str,
+        order_by: Optional[str] = None,
+        reverse: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get every item in a memory, optionally sorted by a field and limited"""
+        results = self.query(memory_id, {})
+        if order_by:
+            results = SimpleRetriever.sort_by_field(results, order_by, reverse=reverse)
+        return results if limit is None else results[:limit]
+
+    def get_time_range(
+        self,
+        memory_id: str,
+        start: str,
+        end: str,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get items with start <= timestamp <= end, newest first"""
+        results = [
+            item for item in self.get_all(memory_id, order_by="timestamp", reverse=True)
+            if start <= item.get("timestamp", "") <= end
+        ]
+        return results if limit is None else results[:limit]
+
+    def query_contains(
+        self,
+        memory_id: str,
+        field: str,
+        values: List[Any],
+    ) -> List[Dict[str, Any]]:
+        """Get items whose field (usually a list) contains any of values"""
+        return [
+            item for item in self.get_all(memory_id)
+            if any(value in item.get(field, []) for value in values)
+        ]
+
     @abstractmethod
     def delete(self, memory_id: str, key: str) -> bool:
         """Delete data by memory_id:key"""
@@ -89,6 +207,14 @@ class StorageEngine(ABC):
         """List all keys in a memory"""
         pass
 
+    def iter_keys(self, memory_id: str) -> Iterator[str]:
+        """Iterate over the keys in a memory"""
+        return iter(self.list_keys(memory_id))
+
+    def count(self, memory_id: str) -> int:
+        """Count items in a memory"""
+        return len(self.list_keys(memory_id))
+
     @abstractmethod
     def list_memories(self) -> List[str]:
         """List all memory IDs"""
@@ -2,8 +2,11 @@
 Main Memory Manager - unified interface for all memory types
 """
 
-from typing import Dict, List, Optional, Any, Union
+import io
+import json
+from typing import Dict, List, Optional, Any, TextIO, Tuple, Union
 from memoryman.storage.sqlite_backend import SQLiteStorage
+from memoryman.utils.serialization import serialize_data
 from memoryman.memory_types.long_term import (
     ShortTermMemory,
     LongTermMemory,
@@ -22,6 +25,9 @@ class MemoryManager:
         >>> memory.get_recent("conversation", limit=5)
     """
 
+    # Valid memory_type values
+    MEMORY_TYPES = frozenset(("short_term", "long_term", "episodic", "semantic"))
+
     def __init__(
         self,
         storage_type: str = "sqlite",
@@ -57,6 +63,22 @@ class MemoryManager:
             "semantic": self.semantic,
         }
 
+        # Bound methods per memory type, so each call is a dict lookup
+        self._ops = {
+            mem_type: {
+                "store": memory.store,
+                "store_many": memory.store_many,
+                "retrieve": memory.retrieve,
+                "query": memory.query,
+                "delete": memory.delete,
+                "get_recent": getattr(memory, "get_recent", None),
+                "list_keys": memory.list_keys,
+                "count": memory.count,
+                "clear": memory.clear,
+            }
+            for mem_type, memory in self.memory_types.items()
+        }
+
     def store(
         self,
         memory_type: str,
@@ -78,21 +100,80 @@ class MemoryManager:
             >>> memory.store("conversation", {"role": "user", "content": "Hi!"})
             >>> memory.store("facts", "The sky is blue", key="fact_1")
         """
-        if memory_type not in self.memory_types:
-            raise ValueError(f"Unknown memory type: {memory_type}")
+        try:
+            ops = self._ops[memory_type]
+        except KeyError:
+            raise ValueError(f"Unknown memory type: {memory_type}") from None
 
         # Convert string to dict if needed
         if isinstance(data, str):
             data = {"content": data}
 
-        # Generate key if not provided
-        if key is None:
-            key = f"{memory_type}_{self.memory_types[memory_type].count()}"
+        if key is not None:
+            ops["store"](key, data)
+            return key
 
-        # Store
-        self.memory_types[memory_type].store(key, data)
+        # Generate the key in the same write transaction as the store, so
+        # another connection cannot take the same number in between
+        with self.storage.batch():
+            key = f"{memory_type}_{ops['count']()}"
+            ops["store"](key, data)
         return key
 
+    def store_many(
+        self,
+        memory_type: str,
+        items: List[Tuple[Optional[str], Union[str, Dict[str, Any]]]],
+    ) -> List[str]:
+        """
+        Store several items in one transaction
+
+        Args:
+            memory_type: Type of memory
+            items: (key, data) pairs; a None key is auto-generated as in store()
+
+        Returns:
+            The keys used, in input order
+
+        Example:
+            >>> memory.store_many("short_term", [(None, "Hi!"), ("msg_2", {"role": "user"})])
+        """
+        try:
+            ops = self._ops[memory_type]
+        except KeyError:
+            raise ValueError(f"Unknown memory type: {memory_type}") from None
+
+        with self.storage.batch():
+            # Number auto keys as if each item were stored in turn
+            next_index = ops["count"]()
+            keys = []
+            batch = {}
+            for key, data in items:
+                if isinstance(data, str):
+                    data = {"content": data}
+                if key is None:
+                    key = f"{memory_type}_{next_index}"
+                next_index += 1
+                keys.append(key)
+                batch[key] = data
+
+            ops["store_many"](batch)
+        return keys
+
+    def batch(self):
+        """
+        Group writes across memory types into one transaction
+
+        Everything written inside the block is committed together when it
+        exits, or rolled back if it raises.
+
+        Example:
+            >>> with memory.batch():
+            ...     memory.store("short_term", "Hello!")
+            ...     memory.store("long_term", {"fact": "User likes tea"})
+        """
+        return self.storage.batch()
+
     def retrieve(self, memory_type: str, key: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve data from memory
@@ -107,15 +188,18 @@ class MemoryManager:
         Example:
             >>> data = memory.retrieve("conversation", "msg_1")
         """
-        if memory_type not in self.memory_types:
-            raise ValueError(f"Unknown memory type: {memory_type}")
+        try:
+            ops = self._ops[memory_type]
+        except KeyError:
+            raise ValueError(f"Unknown memory type: {memory_type}") from None
 
-        return self.memory_types[memory_type].retrieve(key)
+        return ops["retrieve"](key)
 
     def query(
         self,
         memory_type: str,
         search_query: Optional[str] = None,
+        limit: Optional[int] = None,
         **filters,
     ) -> List[Dict[str, Any]]:
         """
@@ -124,6 +208,7 @@ class MemoryManager:
         Args:
             memory_type: Type of memory to query
             search_query: Optional text to search for
+            limit: Maximum number of items to return (None = all)
             **filters: Additional filters (e.g., role="user")
 
         Returns:
@@ -133,10 +218,12 @@ class MemoryManager:
             >>> results = memory.query("conversation", role="user")
             >>> results = memory.query("facts", search_query="weather")
         """
-        if memory_type not in self.memory_types:
-            raise ValueError(f"Unknown memory type: {memory_type}")
+        try:
+            ops = self._ops[memory_type]
+        except KeyError:
+            raise ValueError(f"Unknown memory type: {memory_type}") from None
 
-        return self.memory_types[memory_type].query(search_query or "", **filters)
+        return ops["query"](search_query or "", limit=limit, **filters)
 
     def get_recent(self, memory_type: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -152,28 +239,28 @@ class MemoryManager:
         Example:
             >>> recent = memory.get_recent("conversation", limit=5)
         """
-        if memory_type not in self.memory_types:
-            raise ValueError(f"Unknown memory type: {memory_type}")
+        try:
+            ops = self._ops[memory_type]
+        except KeyError:
+            raise ValueError(f"Unknown memory type: {memory_type}") from None
 
-        if hasattr(self.memory_types[memory_type], "get_recent"):
-            return self.memory_types[memory_type].get_recent(limit)
+        if ops["get_recent"] is not None:
+            return ops["get_recent"](limit)
         else:
             # Fallback for memory types without get_recent
-            all_keys = self.memory_types[memory_type].list_keys()
-            all_data = [
-                self.memory_types[memory_type].retrieve(k) for k in all_keys
-                if self.memory_types[memory_type].retrieve(k)
-            ]
-            # Sort by timestamp and limit
-            from memoryman.core.retrieval import SimpleRetriever
-            sorted_data = SimpleRetriever.sort_by_field(all_data, "timestamp", reverse=True)
-            return sorted_data[:limit]
+            return self.storage.get_all(
+                self.memory_types[memory_type].memory_id,
+                order_by="timestamp",
+                reverse=True,
+                limit=limit,
+            )
 
     def search(
         self,
         query: str,
         memory_types: Optional[List[str]] = None,
         limit: int = 10,
+        min_length: int = 2,
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Search across memory types
@@ -182,6 +269,7 @@ class MemoryManager:
             query: Search query
             memory_types: Which memory types to search (default: all)
             limit: Max results per memory type
+            min_length: Queries shorter than this return no results
 
         Returns:
             Dictionary with results per memory type
@@ -193,13 +281,21 @@ class MemoryManager:
         if memory_types is None:
             memory_types = list(self.memory_types.keys())
 
-        results = {}
-        for mem_type in memory_types:
-            if mem_type in self.memory_types:
-                search_results = self.query(mem_type, search_query=query)
-                results[mem_type] = search_results[:limit]
+        selected = {
+            mem_type: self.memory_types[mem_type]
+            for mem_type in memory_types
+            if mem_type in self.MEMORY_TYPES
+        }
+
+        # Too short to be selective, skip the storage round trip entirely
+        if not query or len(query.strip()) < min_length:
+            return {mem_type: [] for mem_type in selected}
 
-        return results
+        # Search every requested memory in a single storage round trip
+        found = self.storage.search_many(
+            query, {memory.memory_id: memory.search_fields for memory in selected.values()}, limit
+        )
+        return {mem_type: found[memory.memory_id] for mem_type, memory in selected.items()}
 
     def delete(self, memory_type: str, key: str) -> bool:
         """
@@ -215,10 +311,12 @@ class MemoryManager:
         Example:
             >>> memory.delete("conversation", "msg_1")
         """
-        if memory_type not in self.memory_types:
-            raise ValueError(f"Unknown memory type: {memory_type}")
+        try:
+            ops = self._ops[memory_type]
+        except KeyError:
+            raise ValueError(f"Unknown memory type: {memory_type}") from None
 
-        return self.memory_types[memory_type].delete(key)
+        return ops["delete"](key)
 
     def clear(self, memory_type: str) -> None:
         """
@@ -230,10 +328,12 @@ class MemoryManager:
         Example:
             >>> memory.clear("short_term")
         """
-        if memory_type not in self.memory_types:
-            raise ValueError(f"Unknown memory type: {memory_type}")
+        try:
+            ops = self._ops[memory_type]
+        except KeyError:
+            raise ValueError(f"Unknown memory type: {memory_type}") from None
 
-        self.memory_types[memory_type].clear()
+        ops["clear"]()
 
     def clear_all(self) -> None:
         """Clear all memories"""
@@ -255,14 +355,13 @@ class MemoryManager:
             >>> all_counts = memory.count()
         """
         if memory_type:
-            if memory_type not in self.memory_types:
-                raise ValueError(f"Unknown memory type: {memory_type}")
-            return self.memory_types[memory_type].count()
+            try:
+                ops = self._ops[memory_type]
+            except KeyError:
+                raise ValueError(f"Unknown memory type: {memory_type}") from None
+            return ops["count"]()
         else:
-            return {
-                mem_type: self.memory_types[mem_type].count()
-                for mem_type in self.memory_types
-            }
+            return {mem_type: ops["count"]() for mem_type, ops in self._ops.items()}
 
     def list_all(self, memory_type: Optional[str] = None) -> Union[List[str], Dict[str, List[str]]]:
         """
@@ -279,50 +378,65 @@ class MemoryManager:
             >>> all_keys = memory.list_all()
         """
         if memory_type:
-            if memory_type not in self.memory_types:
-                raise ValueError(f"Unknown memory type: {memory_type}")
-            return self.memory_types[memory_type].list_keys()
+            try:
+                ops = self._ops[memory_type]
+            except KeyError:
+                raise ValueError(f"Unknown memory type: {memory_type}") from None
+            return ops["list_keys"]()
         else:
-            return {
-                mem_type: self.memory_types[mem_type].list_keys()
-                for mem_type in self.memory_types
-            }
+            return {mem_type: ops["list_keys"]() for mem_type, ops in self._ops.items()}
 
-    def export_json(self, memory_type: Optional[str] = None) -> str:
+    def export_json(
+        self,
+        memory_type: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> Optional[str]:
         """
         Export memory as JSON
 
+        Rows are streamed from storage one at a time, so exporting to a file
+        never holds a whole memory in RAM.
+
         Args:
             memory_type: Specific type to export (None = all)
+            path: Optional file to write the JSON to
 
         Returns:
-            JSON string
+            JSON string, or None when written to path
 
         Example:
             >>> json_str = memory.export_json("conversation")
+            >>> memory.export_json(path="./backup.json")
         """
-        import json
-
         if memory_type:
-            if memory_type not in self.memory_types:
+            if memory_type not in self.MEMORY_TYPES:
                 raise ValueError(f"Unknown memory type: {memory_type}")
-            keys = self.memory_types[memory_type].list_keys()
-            data = [
-                self.memory_types[memory_type].retrieve(k)
-                for k in keys
-                if self.memory_types[memory_type].retrieve(k)
-            ]
-            return json.dumps({memory_type: data}, indent=2, default=str)
+            selected = [memory_type]
         else:
-            all_data = {}
-            for mem_type in self.memory_types:
-                keys = self.memory_types[mem_type].list_keys()
-                all_data[mem_type] = [
-                    self.memory_types[mem_type].retrieve(k)
-                    for k in keys
-                    if self.memory_types[mem_type].retrieve(k)
-                ]
-            return json.dumps(all_data, indent=2, default=str)
+            selected = list(self.memory_types)
+
+        if path is None:
+            buffer = io.StringIO()
+            self._write_json(buffer, selected)
+            return buffer.getvalue()
+
+        with open(path, "w", encoding="utf-8") as fh:
+            self._write_json(fh, selected)
+        return None
+
+    def _write_json(self, out: TextIO, memory_types: List[str]) -> None:
+        """Write {memory_type: [rows...]} to out, one row per line"""
+        out.write("{")
+        for i, mem_type in enumerate(memory_types):
+            out.write(f'{"," if i else ""}\n  {json.dumps(mem_type)}: [')
+            rows = self.storage.iter_rows(self.memory_types[mem_type].memory_id)
+            empty = True
+            for row in rows:
+                out.write("\n    " if empty else ",\n    ")
+                out.write(serialize_data(row))
+                empty = False
+            out.write("]" if empty else "\n  ]")
+        out.write("\n}" if memory_types else "}")
 
     def close(self) -> None:
         """Close storage connection"""
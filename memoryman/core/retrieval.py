@@ -3,7 +3,10 @@ Retrieval and search utilities
 """
 
 from typing import Any, Dict, List, Optional
+import heapq
 import json
+from operator import itemgetter
+import re
 
 
 class SimpleRetriever:
@@ -17,10 +20,12 @@ class SimpleRetriever:
     @staticmethod
     def filter_by_multiple(items: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Filter items by multiple field values"""
-        result = items
-        for field, value in filters.items():
-            result = SimpleRetriever.filter_by_field(result, field, value)
-        return result
+        # One pass checking every filter, rather than one pass per filter
+        criteria = tuple(filters.items())
+        return [
+            item for item in items
+            if all(item.get(field) == value for field, value in criteria)
+        ]
 
     @staticmethod
     def search_text(items: List[Dict[str, Any]], search_term: str, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
@@ -35,30 +40,31 @@ class SimpleRetriever:
         Returns:
             List of matching items
         """
-        search_term_lower = search_term.lower()
-        results = []
+        # A case-insensitive regex scans each value in C without lowering copies
+        pattern = re.compile(re.escape(search_term), re.IGNORECASE)
+        search = pattern.search
 
-        for item in items:
-            if fields:
-                # Search only in specified fields
-                for field in fields:
-                    if field in item:
-                        value = str(item[field]).lower()
-                        if search_term_lower in value:
-                            results.append(item)
-                            break
-            else:
-                # Search all string fields
-                for key, value in item.items():
-                    if isinstance(value, str) and search_term_lower in value.lower():
-                        results.append(item)
-                        break
+        if fields:
+            # Search only in specified fields
+            return [
+                item for item in items
+                if any(field in item and search(str(item[field])) for field in fields)
+            ]
 
-        return results
+        # Search all string fields
+        return [
+            item for item in items
+            if any(isinstance(value, str) and search(value) for value in item.values())
+        ]
 
     @staticmethod
     def sort_by_field(items: List[Dict[str, Any]], field: str, reverse: bool = False) -> List[Dict[str, Any]]:
         """Sort items by field"""
+        try:
+            # itemgetter is C-level; it raises if any item lacks the field
+            return sorted(items, key=itemgetter(field), reverse=reverse)
+        except (KeyError, TypeError):
+            pass
         try:
             return sorted(items, key=lambda x: x.get(field, ""), reverse=reverse)
         except TypeError:
@@ -73,5 +79,13 @@ class SimpleRetriever:
     @staticmethod
     def get_recent(items: List[Dict[str, Any]], timestamp_field: str = "timestamp", limit: int = 10) -> List[Dict[str, Any]]:
         """Get most recent items by timestamp"""
-        sorted_items = SimpleRetriever.sort_by_field(items, timestamp_field, reverse=True)
-        return SimpleRetriever.limit_results(sorted_items, limit)
+        # heapq's C selection keeps only `limit` items instead of sorting them all
+        try:
+            return heapq.nlargest(limit, items, key=itemgetter(timestamp_field))
+        except (KeyError, TypeError):
+            pass
+        try:
+            return heapq.nlargest(limit, items, key=lambda x: x.get(timestamp_field, ""))
+        except TypeError:
+            # Handle mixed types
+            return SimpleRetriever.limit_results(items, limit)
@@ -8,245 +8,140 @@ from memoryman.core.memory_base import Memory
 from memoryman.core.retrieval import SimpleRetriever
 
 
-class ShortTermMemory(Memory):
-    """Short-term/working memory for recent conversation context"""
-
-    def store(self, key: str, data: Dict[str, Any]) -> None:
-        """Store data in short-term memory"""
-        # Add metadata
-        if "timestamp" not in data:
-            data["timestamp"] = datetime.now().isoformat()
-        if "memory_type" not in data:
-            data["memory_type"] = "short_term"
-
-        self.storage.store(self.memory_id, key, data)
-
-    def retrieve(self, key: str) -> Optional[Dict[str, Any]]:
-        """Retrieve data from short-term memory"""
-        return self.storage.retrieve(self.memory_id, key)
-
-    def query(self, query: str = "", **kwargs) -> List[Dict[str, Any]]:
-        """
-        Query short-term memory
+class _GenericMemory(Memory):
+    """
+    Shared implementation of the built-in memory types
 
-        Args:
-            query: Optional text search query
-            **kwargs: Additional filters (role, etc.)
-
-        Returns:
-            List of matching items
-        """
-        # Get all data for this memory
-        all_keys = self.storage.list_keys(self.memory_id)
-        all_data = [self.retrieve(key) for key in all_keys if self.retrieve(key)]
+    Each type only differs by the class attributes below, so the store,
+    query and delete paths are written once.
+    """
 
-        # Apply filters
-        result = SimpleRetriever.filter_by_multiple(all_data, kwargs) if kwargs else all_data
-
-        # Text search if query provided
-        if query:
-            result = SimpleRetriever.search_text(result, query)
-
-        # Sort by timestamp (most recent first)
-        result = SimpleRetriever.sort_by_field(result, "timestamp", reverse=True)
-
-        return result
-
-    def get_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get most recent messages"""
-        all_keys = self.storage.list_keys(self.memory_id)
-        all_data = [self.retrieve(key) for key in all_keys if self.retrieve(key)]
-        return SimpleRetriever.get_recent(all_data, limit=limit)
+    __slots__ = ()
 
-    def delete(self, key: str) -> bool:
-        """Delete data from short-term memory"""
-        return self.storage.delete(self.memory_id, key)
+    # Value stored in each item's "memory_type" field
+    memory_type = ""
 
-    def clear(self) -> None:
-        """Clear all short-term memory"""
-        self.storage.delete_memory(self.memory_id)
+    # Defaults for missing fields; list values are copied per item
+    _defaults: Dict[str, Any] = {}
 
+    # Field set to the item's key when missing
+    _key_field: Optional[str] = None
 
-class LongTermMemory(Memory):
-    """Long-term memory for persistent storage and facts"""
+    # Return query results most recent first (otherwise storage order,
+    # or relevance for text searches)
+    _newest_first = False
 
-    def store(self, key: str, data: Dict[str, Any]) -> None:
-        """Store data in long-term memory"""
-        # Add metadata
+    def _add_metadata(
+        self, key: str, data: Dict[str, Any], now: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Add metadata defaults for this memory type"""
         if "timestamp" not in data:
-            data["timestamp"] = datetime.now().isoformat()
+            data["timestamp"] = now or datetime.now().isoformat()
         if "memory_type" not in data:
-            data["memory_type"] = "long_term"
-        if "category" not in data:
-            data["category"] = "general"
+            data["memory_type"] = self.memory_type
+        for field, value in self._defaults.items():
+            if field not in data:
+                data[field] = list(value) if isinstance(value, list) else value
+        if self._key_field is not None and self._key_field not in data:
+            data[self._key_field] = key
+        return data
 
-        self.storage.store(self.memory_id, key, data)
+    def store(self, key: str, data: Dict[str, Any]) -> None:
+        """Store data in this memory"""
+        self.storage.store(self.memory_id, key, self._add_metadata(key, data))
 
     def retrieve(self, key: str) -> Optional[Dict[str, Any]]:
-        """Retrieve data from long-term memory"""
+        """Retrieve data from this memory"""
         return self.storage.retrieve(self.memory_id, key)
 
-    def query(self, query: str = "", **kwargs) -> List[Dict[str, Any]]:
+    def query(self, query: str = "", limit: Optional[int] = None, **kwargs) -> List[Dict[str, Any]]:
         """
-        Query long-term memory
+        Query this memory
 
         Args:
             query: Optional text search query
-            **kwargs: Additional filters (category, etc.)
+            limit: Maximum number of items to return (None = all)
+            **kwargs: Additional filters (role, category, etc.)
 
         Returns:
             List of matching items
         """
-        # Get all data
-        all_keys = self.storage.list_keys(self.memory_id)
-        all_data = [self.retrieve(key) for key in all_keys if self.retrieve(key)]
-
-        # Apply filters
-        result = SimpleRetriever.filter_by_multiple(all_data, kwargs) if kwargs else all_data
-
-        # Text search if query provided
-        if query:
-            result = SimpleRetriever.search_text(result, query)
-
-        return result
-
-    def get_by_category(self, category: str) -> List[Dict[str, Any]]:
-        """Get all data in a category"""
-        return self.query(category=category)
+        if not query:
+            # Filter, sort and limit in one storage call
+            if self._newest_first:
+                return self.storage.query(
+                    self.memory_id, kwargs, limit, order_by="timestamp", reverse=True
+                )
+            return self.storage.query(self.memory_id, kwargs, limit)
+
+        # Text search through the storage index, limited in SQL when
+        # nothing can drop or reorder rows afterwards
+        result = self.search(query, None if kwargs or self._newest_first else limit)
+        if kwargs:
+            result = SimpleRetriever.filter_by_multiple(result, kwargs)
+        if self._newest_first:
+            result = SimpleRetriever.sort_by_field(result, "timestamp", reverse=True)
+
+        return result if limit is None else result[:limit]
 
     def delete(self, key: str) -> bool:
-        """Delete data from long-term memory"""
+        """Delete data from this memory"""
         return self.storage.delete(self.memory_id, key)
 
     def clear(self) -> None:
-        """Clear all long-term memory"""
+        """Clear all data in this memory"""
         self.storage.delete_memory(self.memory_id)
 
 
-class EpisodicMemory(Memory):
-    """Episodic memory for specific events and conversations"""
+class ShortTermMemory(_GenericMemory):
+    """Short-term/working memory for recent conversation context"""
 
-    def store(self, key: str, data: Dict[str, Any]) -> None:
-        """Store event/episode in episodic memory"""
-        # Add metadata
-        if "timestamp" not in data:
-            data["timestamp"] = datetime.now().isoformat()
-        if "memory_type" not in data:
-            data["memory_type"] = "episodic"
-        if "episode_id" not in data:
-            data["episode_id"] = key
+    __slots__ = ()
 
-        self.storage.store(self.memory_id, key, data)
+    memory_type = "short_term"
+    _newest_first = True
 
-    def retrieve(self, key: str) -> Optional[Dict[str, Any]]:
-        """Retrieve episode from episodic memory"""
-        return self.storage.retrieve(self.memory_id, key)
-
-    def query(self, query: str = "", **kwargs) -> List[Dict[str, Any]]:
-        """
-        Query episodic memory
+    def get_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get most recent messages"""
+        return self.storage.get_all(self.memory_id, order_by="timestamp", reverse=True, limit=limit)
 
-        Args:
-            query: Optional text search query
-            **kwargs: Additional filters
 
-        Returns:
-            List of matching episodes
-        """
-        # Get all data
-        all_keys = self.storage.list_keys(self.memory_id)
-        all_data = [self.retrieve(key) for key in all_keys if self.retrieve(key)]
+class LongTermMemory(_GenericMemory):
+    """Long-term memory for persistent storage and facts"""
 
-        # Apply filters
-        result = SimpleRetriever.filter_by_multiple(all_data, kwargs) if kwargs else all_data
+    __slots__ = ()
 
-        # Text search if query provided
-        if query:
-            result = SimpleRetriever.search_text(result, query)
+    memory_type = "long_term"
+    _defaults = {"category": "general"}
 
-        # Sort by timestamp (most recent first)
-        result = SimpleRetriever.sort_by_field(result, "timestamp", reverse=True)
+    def get_by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Get all data in a category"""
+        return self.query(category=category)
 
-        return result
 
-    def get_by_date_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-        """Get episodes within a date range"""
-        all_keys = self.storage.list_keys(self.memory_id)
-        all_data = [self.retrieve(key) for key in all_keys if self.retrieve(key)]
+class EpisodicMemory(_GenericMemory):
+    """Episodic memory for specific events and conversations"""
 
-        result = [
-            item for item in all_data
-            if start_date <= item.get("timestamp", "") <= end_date
-        ]
-        return SimpleRetriever.sort_by_field(result, "timestamp", reverse=True)
+    __slots__ = ()
 
-    def delete(self, key: str) -> bool:
-        """Delete episode from episodic memory"""
-        return self.storage.delete(self.memory_id, key)
+    memory_type = "episodic"
+    _key_field = "episode_id"
+    _newest_first = True
 
-    def clear(self) -> None:
-        """Clear all episodic memory"""
-        self.storage.delete_memory(self.memory_id)
+    def get_by_date_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """Get episodes within a date range, newest first"""
+        return self.storage.get_time_range(self.memory_id, start_date, end_date)
 
 
-class SemanticMemory(Memory):
+class SemanticMemory(_GenericMemory):
     """Semantic memory for general knowledge and facts"""
 
-    def store(self, key: str, data: Dict[str, Any]) -> None:
-        """Store fact/knowledge in semantic memory"""
-        # Add metadata
-        if "timestamp" not in data:
-            data["timestamp"] = datetime.now().isoformat()
-        if "memory_type" not in data:
-            data["memory_type"] = "semantic"
-        if "tags" not in data:
-            data["tags"] = []
+    __slots__ = ()
 
-        self.storage.store(self.memory_id, key, data)
-
-    def retrieve(self, key: str) -> Optional[Dict[str, Any]]:
-        """Retrieve fact from semantic memory"""
-        return self.storage.retrieve(self.memory_id, key)
-
-    def query(self, query: str = "", **kwargs) -> List[Dict[str, Any]]:
-        """
-        Query semantic memory
-
-        Args:
-            query: Optional text search query
-            **kwargs: Additional filters
-
-        Returns:
-            List of matching facts
-        """
-        # Get all data
-        all_keys = self.storage.list_keys(self.memory_id)
-        all_data = [self.retrieve(key) for key in all_keys if self.retrieve(key)]
-
-        # Apply filters
-        result = SimpleRetriever.filter_by_multiple(all_data, kwargs) if kwargs else all_data
-
-        # Text search if query provided
-        if query:
-            result = SimpleRetriever.search_text(result, query, fields=["title", "content", "tags"])
-
-        return result
+    memory_type = "semantic"
+    _defaults = {"tags": []}
+    search_fields = ["title", "content", "tags"]
 
     def search_by_tags(self, tags: List[str]) -> List[Dict[str, Any]]:
         """Search facts by tags"""
-        all_keys = self.storage.list_keys(self.memory_id)
-        all_data = [self.retrieve(key) for key in all_keys if self.retrieve(key)]
-
-        result = [
-            item for item in all_data
-            if any(tag in item.get("tags", []) for tag in tags)
-        ]
-        return result
-
-    def delete(self, key: str) -> bool:
-        """Delete fact from semantic memory"""
-        return self.storage.delete(self.memory_id, key)
-
-    def clear(self) -> None:
-        """Clear all semantic memory"""
-        self.storage.delete_memory(self.memory_id)
+        return self.storage.query_contains(self.memory_id, "tags", tags)
@@ -2,28 +2,355 @@
 SQLite storage backend
 """
 
+import os
+import queue
 import sqlite3
 import json
-from typing import Any, Dict, List, Optional
+import math
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from memoryman.core.memory_base import StorageEngine
-from memoryman.utils.serialization import serialize_data, deserialize_data
+from memoryman.utils.serialization import encode_data, deserialize_data
+
+
+# Database-wide settings applied by the writer: WAL lets readers run
+# alongside the writer and NORMAL sync only fsyncs at checkpoints
+_WRITER_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+"""
+
+# Per-connection tuning for the writer and every reader: a ~20MB page cache
+# keeps hot B-tree pages, and up to 256MB of the file is memory-mapped so
+# reads share the OS page cache instead of copying into each connection
+_CONNECTION_PRAGMAS = """
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=5000;
+"""
+
+# sqlite3 keeps compiled statements in a per-connection LRU keyed by SQL text
+_CACHED_STATEMENTS = 256
+
+_SQL_ENSURE_MEMORY = "INSERT OR IGNORE INTO memories (memory_id) VALUES (?)"
+
+# Data is bound as encode_data() output; CAST keeps bytes stored as JSON text
+_SQL_UPSERT_DATA = """
+    INSERT INTO memory_data (memory_id, key, data)
+    VALUES (?, ?, CAST(? AS TEXT))
+    ON CONFLICT(memory_id, key) DO UPDATE SET
+        data=excluded.data,
+        updated_at=CURRENT_TIMESTAMP
+"""
+
+# store() inserts first and only updates on conflict, so it knows whether
+# the key is new and can keep the cached count in step
+_SQL_INSERT_DATA = """
+    INSERT INTO memory_data (memory_id, key, data)
+    VALUES (?, ?, CAST(? AS TEXT))
+    ON CONFLICT(memory_id, key) DO NOTHING
+"""
+
+_SQL_UPDATE_DATA = """
+    UPDATE memory_data SET data = CAST(? AS TEXT), updated_at = CURRENT_TIMESTAMP
+    WHERE memory_id = ? AND key = ?
+"""
+
+_SQL_SELECT_DATA = "SELECT data FROM memory_data WHERE memory_id = ? AND key = ?"
+
+# Rows of a memory in insertion order; bind -1 as the limit for all rows
+_SQL_SELECT_ALL = "SELECT data FROM memory_data WHERE memory_id = ? ORDER BY id LIMIT ?"
+
+# Rows whose timestamp falls in [start, end], newest first via idx_memory_timestamp
+_SQL_SELECT_TIME_RANGE = """
+    SELECT data FROM memory_data
+    WHERE memory_id = ? AND json_extract(data, '$.timestamp') BETWEEN ? AND ?
+    ORDER BY json_extract(data, '$.timestamp') DESC, id DESC
+    LIMIT ?
+"""
+
+_SQL_DELETE_DATA = "DELETE FROM memory_data WHERE memory_id = ? AND key = ?"
+
+_SQL_DELETE_ALL_DATA = "DELETE FROM memory_data WHERE memory_id = ?"
+
+_SQL_DELETE_MEMORY = "DELETE FROM memories WHERE memory_id = ?"
+
+_SQL_LIST_KEYS = "SELECT key FROM memory_data WHERE memory_id = ? ORDER BY id"
+
+_SQL_COUNT = "SELECT COUNT(*) FROM memory_data WHERE memory_id = ?"
+
+# How many of a JSON array of keys already exist in a memory
+_SQL_COUNT_KEYS = """
+    SELECT COUNT(*) FROM memory_data
+    WHERE memory_id = ? AND key IN (SELECT value FROM json_each(?))
+"""
+
+_SQL_LIST_MEMORIES = "SELECT memory_id FROM memories"
+
+# Changes whenever another connection commits to the database
+_SQL_DATA_VERSION = "PRAGMA data_version"
+
+# Best FTS matches in one memory; params are (match, memory_id, limit)
+_SQL_SEARCH = """
+    SELECT memory_data.data FROM memory_fts
+    JOIN memory_data ON memory_data.id = memory_fts.rowid
+    WHERE memory_fts MATCH ? AND memory_fts.memory_id = ?
+    ORDER BY bm25(memory_fts)
+    LIMIT ?
+"""
+
+# Best matches per memory for one MATCH over several memories; "{ids}" is
+# the memory_id placeholders, params are (match, *memory_ids, limit)
+_SQL_SEARCH_MANY = """
+    SELECT memory_id, data, rank FROM (
+        SELECT memory_fts.memory_id AS memory_id, memory_data.data AS data,
+            ROW_NUMBER() OVER (
+                PARTITION BY memory_fts.memory_id ORDER BY bm25(memory_fts)
+            ) AS rank
+        FROM memory_fts
+        JOIN memory_data ON memory_data.id = memory_fts.rowid
+        WHERE memory_fts MATCH ? AND memory_fts.memory_id IN ({ids})
+    )
+    WHERE ? < 0 OR rank <= ?
+"""
+
+# Data fields exposed as indexed generated columns for query() filters
+INDEXED_FIELDS = ("role", "category")
+
+# Generated columns need SQLite 3.31+; "{field}" is one of INDEXED_FIELDS
+_SQL_ADD_INDEXED_COLUMN = """
+    ALTER TABLE memory_data ADD COLUMN {field}
+    GENERATED ALWAYS AS (json_extract(data, '$.{field}')) VIRTUAL
+"""
+
+# Columns of the full-text index; "body" holds every string value of the row
+FTS_COLUMNS = ("content", "title", "tags")
+
+# FTS5 table definition: porter stemming so "learned" finds "learning", and
+# 2/3-character prefix indexes for single-word prefix queries
+_FTS_DEFINITION = (
+    "memory_id UNINDEXED, content, title, tags, body, "
+    "prefix='2 3', tokenize='porter unicode61'"
+)
+
+# Index values for a memory_data row; "{row}" is "new" in triggers or the table name
+_FTS_VALUES = """
+    {row}.id, {row}.memory_id,
+    json_extract({row}.data, '$.content'),
+    json_extract({row}.data, '$.title'),
+    json_extract({row}.data, '$.tags'),
+    (SELECT group_concat(value, ' ') FROM json_tree({row}.data) WHERE type = 'text')
+"""
+
+
+def _is_sql_scalar(value: Any) -> bool:
+    """Whether value binds to SQLite as the same value JSON1 extracts"""
+    if isinstance(value, int):
+        return -2**63 <= value < 2**63
+    return value is None or isinstance(value, (str, float))
+
+
+def _is_sql_member(value: Any) -> bool:
+    """Whether `value IN (...)` finds value among JSON1's array elements"""
+    # NULL never compares equal, and NaN binds as NULL
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
+        return False
+    return _is_sql_scalar(value)
+
+
+# Text that every JSON encoder writes verbatim: printable ASCII without
+# quotes or backslashes
+_JSON_VERBATIM = re.compile(r'[ !#-\[\]-~]*')
+
+
+def _json_needles(field: str, value: Any) -> Optional[Tuple[str, str]]:
+    """
+    Quoted key and value that every stored row with data[field] == value contains
+
+    They are looked up separately with instr(), so the check holds whatever
+    separators the row was written with and has no pattern length limit.
+    Rows it lets through still need the exact check. Returns None when the
+    value's JSON form is not predictable.
+    """
+    if not isinstance(field, str) or not isinstance(value, str):
+        return None
+    if not _JSON_VERBATIM.fullmatch(field + value):
+        return None
+    return f'"{field}"', f'"{value}"'
 
 
 class SQLiteStorage(StorageEngine):
-    """SQLite-based storage backend"""
+    """
+    SQLite-based storage backend
+
+    A single connection handles all writes (each in a ``BEGIN IMMEDIATE``
+    transaction) while reads are served from a pool of read-only
+    connections, so lookups and searches are not blocked by writers.
 
-    def __init__(self, db_path: str):
+    Durability: the database runs in WAL mode with ``synchronous=NORMAL``.
+    A committed write survives an application crash, but the last
+    transactions before a power loss or OS crash may be rolled back. The
+    database itself is never corrupted.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        read_connections: Optional[int] = None,
+    ):
         """
         Initialize SQLite storage
 
         Args:
             db_path: Path to SQLite database file
+            read_connections: Size of the read-only connection pool
+                (default: CPU count, at most 8)
         """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            isolation_level="IMMEDIATE",
+            cached_statements=_CACHED_STATEMENTS,
+        )
+        self.conn.executescript(_WRITER_PRAGMAS + _CONNECTION_PRAGMAS)
+        self._write_lock = threading.RLock()
+        self._batch_depth = 0
+        self._batch_thread: Optional[int] = None
+        self._counts: Dict[str, int] = {}
+
+        self.fts_enabled = False
         self._init_tables()
 
+        # Writes are serialized by _write_lock, so they can share one cursor
+        self._cursor = self.conn.cursor()
+
+        # Memories with a row in the memories table, so writes can skip
+        # _SQL_ENSURE_MEMORY
+        self._known_memories = {
+            row[0] for row in self._cursor.execute(_SQL_LIST_MEMORIES)
+        }
+
+        # Cached counts, memories and rows only follow this instance's
+        # writes; they are dropped when data_version shows another commit
+        self._data_version = self.conn.execute(_SQL_DATA_VERSION).fetchone()[0]
+
+        # In-memory databases are private to their connection, so reads
+        # have to share the write connection
+        self._read_pool: Optional[queue.Queue] = None
+        if db_path not in ("", ":memory:"):
+            if read_connections is None:
+                read_connections = min(os.cpu_count() or 1, 8)
+            self._read_pool = queue.Queue()
+            for _ in range(read_connections):
+                self._read_pool.put(self._connect_reader())
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database file"""
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(
+            uri, uri=True, check_same_thread=False, cached_statements=_CACHED_STATEMENTS
+        )
+        conn.executescript(_CONNECTION_PRAGMAS)
+        return conn
+
+    @contextmanager
+    def _with_read(self, dedicated: bool = False):
+        """
+        Borrow a connection for reading
+
+        Args:
+            dedicated: Open a connection just for this read instead of
+                taking one from the pool, for iterators whose lifetime is
+                up to the caller
+        """
+        # Inside a batch, read through the writer to see uncommitted rows
+        if self._read_pool is None or self._batch_thread == threading.get_ident():
+            yield self.conn
+            return
+
+        conn = None
+        if not dedicated:
+            try:
+                conn = self._read_pool.get_nowait()
+            except queue.Empty:
+                pass
+
+        if conn is None:
+            # Dedicated, or every pooled connection is busy (possibly held by
+            # this same thread), so use a temporary one rather than wait
+            conn = self._connect_reader()
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    def _check_external_writes(self) -> None:
+        """Drop cached state if another connection committed since the last check"""
+        # Under the write lock, so no write can number keys from a count
+        # between the version moving on and the caches being dropped
+        with self._write_lock:
+            version = self.conn.execute(_SQL_DATA_VERSION).fetchone()[0]
+            if version == self._data_version:
+                return
+            self._data_version = version
+
+            self._counts.clear()
+            self._known_memories.clear()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group writes into a single transaction
+
+        Commits when the block exits and rolls back if it raises. Writes
+        made inside the block (including nested batches) join the
+        transaction instead of committing one by one. Other threads' writes
+        wait until the batch ends.
+
+        Example:
+            >>> with storage.batch():
+            ...     storage.store("notes", "a", {"content": "one"})
+            ...     storage.store("notes", "b", {"content": "two"})
+        """
+        with self._write_lock:
+            if self._batch_depth:
+                self._batch_depth += 1
+                try:
+                    yield
+                finally:
+                    self._batch_depth -= 1
+                return
+
+            self.conn.execute("BEGIN IMMEDIATE")
+            # The transaction now sees every commit, so catch up with them
+            self._check_external_writes()
+            self._batch_depth = 1
+            self._batch_thread = threading.get_ident()
+            try:
+                yield
+            except BaseException:
+                self.conn.rollback()
+                # Cached counts and memories may include rolled back writes
+                self._counts.clear()
+                self._known_memories.clear()
+                raise
+            else:
+                self.conn.commit()
+            finally:
+                self._batch_depth = 0
+                self._batch_thread = None
+
     def _init_tables(self) -> None:
         """Initialize database tables"""
         cursor = self.conn.cursor()
@@ -57,100 +384,442 @@ class SQLiteStorage(StorageEngine):
             ON memory_data(memory_id)
         """)
 
+        # Databases from before the JSON indexes may hold rows SQLite cannot
+        # parse, which would make building those indexes fail
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_memory_timestamp'"
+        )
+        if cursor.fetchone() is None:
+            self._repair_json(cursor)
+
+        # Lets "most recent first" reads walk an index instead of sorting
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_memory_timestamp
+            ON memory_data(memory_id, json_extract(data, '$.timestamp'))
+        """)
+
+        # Common filter fields become generated columns with an index, so
+        # query() can narrow rows in SQL instead of decoding all of them
+        cursor.execute("PRAGMA table_xinfo(memory_data)")
+        columns = {row[1] for row in cursor.fetchall()}  # (cid, name, ...)
+        indexed = []
+        for field in INDEXED_FIELDS:
+            if field not in columns:
+                try:
+                    cursor.execute(_SQL_ADD_INDEXED_COLUMN.format(field=field))
+                except sqlite3.OperationalError:
+                    # SQLite without generated columns, filter in Python only
+                    continue
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_memory_{field}
+                ON memory_data(memory_id, {field})
+            """)
+            indexed.append(field)
+        self._indexed_fields = tuple(indexed)
+
+        self._init_fts(cursor)
+
         self.conn.commit()
 
+    @staticmethod
+    def _repair_json(cursor: sqlite3.Cursor) -> None:
+        """Rewrite rows stored with NaN/Infinity as valid JSON (null)"""
+        cursor.execute("SELECT id, data FROM memory_data WHERE NOT json_valid(data)")
+        for row_id, data in cursor.fetchall():
+            try:
+                # The stdlib parser accepts the NaN/Infinity it used to write
+                item = json.loads(data)
+            except ValueError:
+                continue
+            cursor.execute(
+                "UPDATE memory_data SET data = CAST(? AS TEXT) WHERE id = ?",
+                (encode_data(item), row_id)
+            )
+
+    def _init_fts(self, cursor: sqlite3.Cursor) -> None:
+        """Create the FTS5 index over memory_data, kept in sync by triggers"""
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'memory_fts'"
+        )
+        row = cursor.fetchone()
+        exists = row is not None
+        if exists and _FTS_DEFINITION not in row[0]:
+            # Built with older settings, rebuild it from memory_data below
+            cursor.execute("DROP TABLE memory_fts")
+            exists = False
+
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5({_FTS_DEFINITION})"
+            )
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5, search falls back to scanning rows
+            return
+
+        columns = "rowid, memory_id, content, title, tags, body"
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_fts_insert AFTER INSERT ON memory_data
+            BEGIN
+                INSERT INTO memory_fts ({columns}) VALUES ({_FTS_VALUES.format(row="new")});
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_fts_delete AFTER DELETE ON memory_data
+            BEGIN
+                DELETE FROM memory_fts WHERE rowid = old.id;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_fts_update AFTER UPDATE OF data ON memory_data
+            BEGIN
+                DELETE FROM memory_fts WHERE rowid = old.id;
+                INSERT INTO memory_fts ({columns}) VALUES ({_FTS_VALUES.format(row="new")});
+            END
+        """)
+
+        if not exists:
+            # Index rows written before the FTS table existed or was rebuilt
+            cursor.execute(f"""
+                INSERT INTO memory_fts ({columns})
+                SELECT {_FTS_VALUES.format(row="memory_data")} FROM memory_data
+            """)
+
+        self.fts_enabled = True
+
+    @staticmethod
+    def _fts_query(text: str, fields: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Build a safe FTS5 MATCH expression from free text
+
+        Punctuation is stripped and the remaining words are matched as a
+        phrase, so user input can never be parsed as FTS5 query syntax. A
+        single word is matched as a prefix ("learn" finds "learning").
+        """
+        tokens = re.findall(r"\w+", text)
+        if not tokens:
+            return None
+
+        expression = '"' + " ".join(tokens) + '"'
+        if len(tokens) == 1:
+            expression += "*"
+        if fields is not None:
+            columns = [field for field in fields if field in FTS_COLUMNS] or ["body"]
+            expression = "{" + " ".join(columns) + "} : " + expression
+        return expression
+
     def store(self, memory_id: str, key: str, data: Dict[str, Any]) -> None:
         """Store data"""
-        cursor = self.conn.cursor()
+        # Serialize data
+        serialized = encode_data(data)
 
-        # Ensure memory exists
-        cursor.execute("INSERT OR IGNORE INTO memories (memory_id) VALUES (?)", (memory_id,))
+        with self.batch():
+            cursor = self._cursor
 
-        # Serialize data
-        serialized = serialize_data(data)
+            # Ensure memory exists
+            if memory_id not in self._known_memories:
+                cursor.execute(_SQL_ENSURE_MEMORY, (memory_id,))
+                self._known_memories.add(memory_id)
 
-        # Insert or update data
-        cursor.execute("""
-            INSERT INTO memory_data (memory_id, key, data)
-            VALUES (?, ?, ?)
-            ON CONFLICT(memory_id, key) DO UPDATE SET 
-                data=excluded.data,
-                updated_at=CURRENT_TIMESTAMP
-        """, (memory_id, key, serialized))
+            # Insert, or update if the key already exists
+            cursor.execute(_SQL_INSERT_DATA, (memory_id, key, serialized))
+            if cursor.rowcount:
+                if memory_id in self._counts:
+                    self._counts[memory_id] += 1
+            else:
+                cursor.execute(_SQL_UPDATE_DATA, (serialized, memory_id, key))
 
-        self.conn.commit()
+    def store_many(self, memory_id: str, items: Dict[str, Dict[str, Any]]) -> None:
+        """Store several items in a single transaction"""
+        rows = [(memory_id, key, encode_data(data)) for key, data in items.items()]
+
+        with self.batch():
+            if memory_id not in self._known_memories:
+                self._cursor.execute(_SQL_ENSURE_MEMORY, (memory_id,))
+                self._known_memories.add(memory_id)
+
+            # executemany cannot tell inserts from updates, so count the
+            # existing keys up front to keep a cached count current
+            if memory_id in self._counts:
+                self._cursor.execute(_SQL_COUNT_KEYS, (memory_id, json.dumps(list(items))))
+                self._counts[memory_id] += len(items) - self._cursor.fetchone()[0]
+
+            self._cursor.executemany(_SQL_UPSERT_DATA, rows)
 
     def retrieve(self, memory_id: str, key: str) -> Optional[Dict[str, Any]]:
         """Retrieve data"""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT data FROM memory_data WHERE memory_id = ? AND key = ?",
-            (memory_id, key)
-        )
-        row = cursor.fetchone()
+        with self._with_read() as conn:
+            row = conn.execute(_SQL_SELECT_DATA, (memory_id, key)).fetchone()
+        return deserialize_data(row[0]) if row else None
 
-        if row:
-            return deserialize_data(row["data"])
-        return None
+    @staticmethod
+    def _order_clause(order_by: Optional[str], reverse: bool) -> Tuple[str, List[Any]]:
+        """ORDER BY terms and their params; ties keep insertion order"""
+        direction = "DESC" if reverse else "ASC"
+        if order_by == "timestamp":
+            # Literal expression so the planner can use idx_memory_timestamp
+            return f"json_extract(data, '$.timestamp') {direction}, id {direction}", []
+        if order_by:
+            return f"json_extract(data, ?) {direction}, id {direction}", [f'$."{order_by}"']
+        return f"id {direction}", []
 
-    def query(self, memory_id: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Query data by filters"""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT data FROM memory_data WHERE memory_id = ?",
-            (memory_id,)
-        )
-        rows = cursor.fetchall()
+    def query(
+        self,
+        memory_id: str,
+        filters: Dict[str, Any],
+        limit: Optional[int] = None,
+        order_by: Optional[str] = None,
+        reverse: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Query data by filters, sorted in SQL"""
+        if not filters:
+            return self.get_all(memory_id, order_by, reverse, limit)
 
-        # Deserialize all data
-        all_data = [deserialize_data(row["data"]) for row in rows]
-
-        # Apply filters
-        result = all_data
+        # Scalar filters on indexed fields narrow the rows in SQL, and string
+        # filters on other fields prune rows with instr() over the raw JSON;
+        # every filter is still checked in Python for exact equality semantics
+        where = ["memory_id = ?"]
+        params: List[Any] = [memory_id]
         for field, value in filters.items():
-            result = [item for item in result if item.get(field) == value]
+            if field in self._indexed_fields and _is_sql_scalar(value):
+                where.append(f"{field} IS ?")
+                params.append(value)
+                continue
+            needles = _json_needles(field, value)
+            if needles is not None:
+                where.append("instr(data, ?) > 0 AND instr(data, ?) > 0")
+                params.extend(needles)
+        order, order_params = self._order_clause(order_by, reverse)
+        sql = f"SELECT data FROM memory_data WHERE {' AND '.join(where)} ORDER BY {order}"
+        params.extend(order_params)
+
+        # Stop reading once enough rows match
+        criteria = tuple(filters.items())
+        result = []
+        with self._with_read() as conn:
+            cursor = conn.execute(sql, params)
+            for row in cursor:
+                item = deserialize_data(row[0])
+                if all(item.get(field) == value for field, value in criteria):
+                    result.append(item)
+                    if limit is not None and len(result) >= limit:
+                        break
+            cursor.close()
+        return result
+
+    def search(
+        self,
+        memory_id: str,
+        query: str,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Full-text search using the FTS5 index, best matches first"""
+        if not self.fts_enabled:
+            return super().search(memory_id, query, limit, fields)
+
+        match = self._fts_query(query, fields)
+        if match is None:
+            return []
+
+        with self._with_read() as conn:
+            rows = conn.execute(
+                _SQL_SEARCH, (match, memory_id, -1 if limit is None else limit)
+            ).fetchall()
+        return [deserialize_data(row[0]) for row in rows]
+
+    def search_many(
+        self,
+        query: str,
+        targets: Dict[str, Optional[List[str]]],
+        limit: Optional[int] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search several memories in one statement
+
+        Memories searching the same fields share a single FTS5 MATCH, ranked
+        per memory with a window function, so the index is walked once per
+        distinct set of fields rather than once per memory.
+        """
+        # ROW_NUMBER() needs SQLite 3.25+, older builds search one by one
+        if not self.fts_enabled or sqlite3.sqlite_version_info < (3, 25, 0):
+            return super().search_many(query, targets, limit)
+
+        results: Dict[str, List[Dict[str, Any]]] = {memory_id: [] for memory_id in targets}
+        groups: Dict[str, List[str]] = {}
+        for memory_id, fields in targets.items():
+            match = self._fts_query(query, fields)
+            if match is not None:
+                groups.setdefault(match, []).append(memory_id)
+
+        if not groups:
+            return results
+
+        bound = -1 if limit is None else limit
+        selects = []
+        params: List[Any] = []
+        for match, memory_ids in groups.items():
+            selects.append(_SQL_SEARCH_MANY.format(ids=", ".join("?" * len(memory_ids))))
+            params.extend((match, *memory_ids, bound, bound))
+        sql = " UNION ALL ".join(selects) + " ORDER BY memory_id, rank"
+
+        with self._with_read() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        for row in rows:
+            results[row[0]].append(deserialize_data(row[1]))
+        return results
+
+    def get_all(
+        self,
+        memory_id: str,
+        order_by: Optional[str] = None,
+        reverse: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get every item in a memory with a single query"""
+        order, order_params = self._order_clause(order_by, reverse)
+        params = [memory_id, *order_params, -1 if limit is None else limit]
+
+        with self._with_read() as conn:
+            rows = conn.execute(
+                f"SELECT data FROM memory_data WHERE memory_id = ? ORDER BY {order} LIMIT ?",
+                params
+            ).fetchall()
+        return [deserialize_data(row[0]) for row in rows]
+
+    def get_time_range(
+        self,
+        memory_id: str,
+        start: str,
+        end: str,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get items with start <= timestamp <= end, newest first, using the index"""
+        with self._with_read() as conn:
+            rows = conn.execute(
+                _SQL_SELECT_TIME_RANGE, (memory_id, start, end, -1 if limit is None else limit)
+            ).fetchall()
+        return [deserialize_data(row[0]) for row in rows]
 
+    def query_contains(
+        self,
+        memory_id: str,
+        field: str,
+        values: List[Any],
+    ) -> List[Dict[str, Any]]:
+        """Get items whose field contains any of values, in insertion order"""
+        if not values or not all(_is_sql_member(value) for value in values):
+            return super().query_contains(memory_id, field, values)
+
+        # JSON1 walks array fields in C so only likely matches get decoded;
+        # string and object fields use Python's substring/key semantics,
+        # so they are passed through and everything is checked again below
+        path = f'$."{field}"'
+        placeholders = ", ".join("?" * len(values))
+        sql = f"""
+            SELECT data FROM memory_data
+            WHERE memory_id = ? AND (
+                json_type(data, ?) IN ('text', 'object')
+                OR EXISTS (SELECT 1 FROM json_each(data, ?) WHERE value IN ({placeholders}))
+            )
+            ORDER BY id
+        """
+        with self._with_read() as conn:
+            rows = conn.execute(sql, (memory_id, path, path, *values)).fetchall()
+
+        result = []
+        for row in rows:
+            item = deserialize_data(row[0])
+            container = item.get(field, [])
+            if any(value in container for value in values):
+                result.append(item)
         return result
 
+    def iter_rows(self, memory_id: str, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every item in a memory, in insertion order
+
+        Rows are fetched batch_size at a time through a read connection of
+        the iterator's own, closed once it is exhausted or closed, so other
+        reads can run while it is partly consumed.
+        """
+        with self._with_read(dedicated=True) as conn:
+            cursor = conn.execute(_SQL_SELECT_ALL, (memory_id, -1))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield deserialize_data(row[0])
+
     def delete(self, memory_id: str, key: str) -> bool:
         """Delete data"""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "DELETE FROM memory_data WHERE memory_id = ? AND key = ?",
-            (memory_id, key)
-        )
-        self.conn.commit()
-        return cursor.rowcount > 0
+        with self.batch():
+            self._cursor.execute(_SQL_DELETE_DATA, (memory_id, key))
+            deleted = self._cursor.rowcount > 0
+            if deleted and memory_id in self._counts:
+                self._counts[memory_id] -= 1
+        return deleted
 
     def delete_memory(self, memory_id: str) -> None:
         """Delete entire memory"""
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM memory_data WHERE memory_id = ?", (memory_id,))
-        cursor.execute("DELETE FROM memories WHERE memory_id = ?", (memory_id,))
-        self.conn.commit()
+        with self.batch():
+            self._cursor.execute(_SQL_DELETE_ALL_DATA, (memory_id,))
+            self._cursor.execute(_SQL_DELETE_MEMORY, (memory_id,))
+            self._known_memories.discard(memory_id)
+            self._counts[memory_id] = 0
 
     def list_keys(self, memory_id: str) -> List[str]:
         """List all keys in a memory"""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT key FROM memory_data WHERE memory_id = ? ORDER BY created_at",
-            (memory_id,)
-        )
-        return [row["key"] for row in cursor.fetchall()]
+        with self._with_read() as conn:
+            rows = conn.execute(_SQL_LIST_KEYS, (memory_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def iter_keys(self, memory_id: str, batch_size: int = 1000) -> Iterator[str]:
+        """
+        Iterate over the keys in a memory, in insertion order
+
+        Like iter_rows, keys are fetched batch_size at a time through a read
+        connection of the iterator's own.
+        """
+        with self._with_read(dedicated=True) as conn:
+            cursor = conn.execute(_SQL_LIST_KEYS, (memory_id,))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0]
+
+    def count(self, memory_id: str) -> int:
+        """
+        Count items in a memory
+
+        The first call runs COUNT(*); afterwards the count is kept up to date
+        by this instance's writes, and recounted once another connection
+        has committed.
+        """
+        with self._write_lock:
+            self._check_external_writes()
+            if memory_id not in self._counts:
+                self._cursor.execute(_SQL_COUNT, (memory_id,))
+                self._counts[memory_id] = self._cursor.fetchone()[0]
+            return self._counts[memory_id]
 
     def list_memories(self) -> List[str]:
         """List all memory IDs"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT memory_id FROM memories")
-        return [row["memory_id"] for row in cursor.fetchall()]
+        with self._with_read() as conn:
+            rows = conn.execute(_SQL_LIST_MEMORIES).fetchall()
+        return [row[0] for row in rows]
 
     def close(self) -> None:
-        """Close database connection"""
-        self.conn.close()
+        """
+        Close database connections
 
-    def __del__(self):
-        """Cleanup on deletion"""
-        try:
-            self.close()
-        except:
-            pass
+        Not done on garbage collection; call close() or use MemoryManager
+        as a context manager.
+        """
+        if self._read_pool is not None:
+            while not self._read_pool.empty():
+                self._read_pool.get_nowait().close()
+        self.conn.close()
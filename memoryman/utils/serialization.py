@@ -3,30 +3,117 @@ Utility functions for data serialization and deserialization
 """
 
 import json
-from typing import Any, Dict
+import math
+import re
+from typing import Any, Dict, Union
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
 
-def serialize_data(data: Dict[str, Any]) -> str:
+if orjson is not None:
+    # Hand datetimes and dataclasses to default=str like the stdlib path,
+    # so stored text does not depend on whether orjson is installed
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+# A run of 19+ digits may be an integer orjson.loads would silently turn
+# into a float: beyond 64 bits, or a 19-digit one below -2**63
+_LONG_NUMBER = re.compile(r"\d{19}")
+_LONG_NUMBER_BYTES = re.compile(rb"\d{19}")
+
+
+def _finite(value: Any) -> Any:
+    """Copy of value with NaN and infinite floats replaced by None"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _json_dumps(data: Any, **kwargs) -> str:
+    """
+    json.dumps that writes non-finite floats as null, like orjson
+
+    The stdlib would write NaN/Infinity, which are not valid JSON and which
+    SQLite's JSON functions reject.
+    """
+    try:
+        return json.dumps(data, allow_nan=False, **kwargs)
+    except ValueError:
+        return json.dumps(_finite(data), allow_nan=False, **kwargs)
+
+
+def serialize_data(data: Dict[str, Any], indent: bool = False) -> str:
     """
     Serialize data to JSON string
 
+    Uses orjson when it is installed, otherwise the stdlib json module.
+    NaN and infinite floats have no JSON form and are written as null.
+
     Args:
         data: Dictionary to serialize
+        indent: Pretty-print with two-space indentation
 
     Returns:
         JSON string
     """
-    return json.dumps(data, default=str)
+    if orjson is not None:
+        option = _ORJSON_OPTIONS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, default=str, option=option).decode()
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which only the stdlib can write
+            pass
+    return _json_dumps(data, indent=2 if indent else None, default=str)
 
 
-def deserialize_data(data_str: str) -> Dict[str, Any]:
+def encode_data(data: Dict[str, Any]) -> Union[bytes, str]:
+    """
+    Serialize data to compact JSON for storage
+
+    With orjson this returns its UTF-8 bytes directly, skipping the decode
+    to str; bind it with CAST(? AS TEXT) to store it as JSON text.
+
+    Args:
+        data: Dictionary to serialize
+
+    Returns:
+        JSON as UTF-8 bytes (orjson) or str (stdlib fallback)
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+    # Same compact layout orjson produces, no padding after separators
+    return _json_dumps(data, default=str, separators=(",", ":"))
+
+
+def deserialize_data(data_str: Union[str, bytes]) -> Dict[str, Any]:
     """
     Deserialize JSON string to dictionary
 
+    Payloads that may hold integers orjson reads as floats (beyond 64 bits)
+    are parsed by the stdlib, which keeps them exact.
+
     Args:
-        data_str: JSON string to deserialize
+        data_str: JSON string or UTF-8 bytes to deserialize
 
     Returns:
         Dictionary
     """
+    if orjson is not None:
+        pattern = _LONG_NUMBER_BYTES if isinstance(data_str, bytes) else _LONG_NUMBER
+        if pattern.search(data_str) is None:
+            return orjson.loads(data_str)
     return json.loads(data_str)
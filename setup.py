@@ -29,5 +29,6 @@ setup(
     extras_require={
         "dev": ["pytest>=7.0", "pytest-cov>=4.0"],
         "vector": ["chromadb>=0.3.0"],
+        "fast": ["orjson>=3.6"],
     },
 )
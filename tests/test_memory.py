@@ -5,8 +5,15 @@ Unit tests for Memory Man module
 import pytest
 import tempfile
 import os
+import json
+import sqlite3
+import threading
 from datetime import datetime
 from memoryman import MemoryManager
+from memoryman.storage import sqlite_backend
+from memoryman.storage.sqlite_backend import SQLiteStorage
+from memoryman.utils import serialization
+from memoryman.core.retrieval import SimpleRetriever
 
 
 @pytest.fixture
@@ -51,6 +58,23 @@ class TestMemoryManager:
         assert retrieved is not None
         assert retrieved["content"] == "Simple message"
 
+    def test_store_many(self, memory_manager):
+        """Test storing a batch of items with generated and explicit keys"""
+        keys = memory_manager.store_many("long_term", [
+            (None, "First"),
+            ("fact_x", {"title": "Explicit", "category": "facts"}),
+            (None, "Third"),
+        ])
+
+        assert keys == ["long_term_0", "fact_x", "long_term_2"]
+        assert memory_manager.count("long_term") == 3
+        assert memory_manager.retrieve("long_term", "long_term_0")["category"] == "general"
+        assert memory_manager.retrieve("long_term", "fact_x")["category"] == "facts"
+
+        # Items stored together share one timestamp
+        timestamps = {item["timestamp"] for item in memory_manager.query("long_term")}
+        assert len(timestamps) == 1
+
     def test_store_long_term(self, memory_manager):
         """Test long-term memory storage"""
         data = {
@@ -97,6 +121,18 @@ class TestMemoryManager:
         assert len(user_msgs) == 2
         assert all(msg["role"] == "user" for msg in user_msgs)
 
+    def test_query_most_recent_first(self, memory_manager):
+        """Test that filtered queries come back newest first and limited"""
+        for day in (2, 3, 1):
+            memory_manager.store(
+                "short_term",
+                {"role": "user", "content": f"Day {day}", "timestamp": f"2025-01-0{day}T00:00:00"},
+                key=f"msg_{day}",
+            )
+
+        results = memory_manager.query("short_term", role="user", limit=2)
+        assert [msg["content"] for msg in results] == ["Day 3", "Day 2"]
+
     def test_search_query(self, memory_manager):
         """Test text search"""
         memory_manager.store("short_term", {"content": "Hello world"}, key="msg_1")
@@ -106,6 +142,54 @@ class TestMemoryManager:
         results = memory_manager.query("short_term", search_query="Hello")
         assert len(results) == 2
 
+    def test_query_limit(self, memory_manager):
+        """Test limiting query results"""
+        for i in range(5):
+            role = "user" if i % 2 else "assistant"
+            memory_manager.store("long_term", {"role": role, "content": f"Fact {i}"}, key=f"fact_{i}")
+
+        assert len(memory_manager.query("long_term", limit=3)) == 3
+        assert len(memory_manager.query("long_term", search_query="fact", limit=2)) == 2
+        assert len(memory_manager.query("long_term", role="user", limit=5)) == 2
+        assert len(memory_manager.storage.query("long_term", {"role": "assistant"}, limit=2)) == 2
+
+    def test_search_query_punctuation(self, memory_manager):
+        """Test that FTS syntax characters in a search are treated as text"""
+        memory_manager.store("short_term", {"content": "Hello world"}, key="msg_1")
+
+        results = memory_manager.query("short_term", search_query='"hello"* (world')
+        assert len(results) == 1
+        assert memory_manager.query("short_term", search_query="?!") == []
+
+    def test_search_limit(self, memory_manager):
+        """Test that search results are limited per memory type"""
+        for i in range(5):
+            memory_manager.store("long_term", {"content": f"Python fact {i}"}, key=f"fact_{i}")
+
+        results = memory_manager.search("python", memory_types=["long_term"], limit=3)
+        assert len(results["long_term"]) == 3
+
+    def test_search_short_query(self, memory_manager):
+        """Test that empty and one-character searches return nothing"""
+        memory_manager.store("short_term", {"content": "a b c"}, key="msg_1")
+
+        assert memory_manager.search("", limit=5)["short_term"] == []
+        assert memory_manager.search(" a ", limit=5)["short_term"] == []
+
+    def test_search_prefix(self, memory_manager):
+        """Test that a single search word also matches longer words"""
+        memory_manager.store("semantic", {"title": "Machine learning basics"}, key="know_1")
+
+        results = memory_manager.search("learn", memory_types=["semantic"])
+        assert len(results["semantic"]) == 1
+
+    def test_search_stemming(self, memory_manager):
+        """Test that searches match other forms of the same word"""
+        memory_manager.store("long_term", {"content": "The model learned quickly"}, key="fact_1")
+
+        results = memory_manager.query("long_term", search_query="learning")
+        assert len(results) == 1
+
     def test_get_recent(self, memory_manager):
         """Test getting recent items"""
         for i in range(5):
@@ -114,6 +198,18 @@ class TestMemoryManager:
         recent = memory_manager.get_recent("short_term", limit=2)
         assert len(recent) == 2
 
+    def test_get_recent_fallback(self, memory_manager):
+        """Test get_recent on a memory type without its own get_recent"""
+        for day in (3, 1, 2):
+            memory_manager.store(
+                "long_term",
+                {"title": f"Fact {day}", "timestamp": f"2025-01-0{day}T00:00:00"},
+                key=f"fact_{day}",
+            )
+
+        recent = memory_manager.get_recent("long_term", limit=2)
+        assert [item["title"] for item in recent] == ["Fact 3", "Fact 2"]
+
     def test_delete(self, memory_manager):
         """Test deleting items"""
         memory_manager.store("short_term", {"content": "Test"}, key="msg_1")
@@ -142,6 +238,19 @@ class TestMemoryManager:
         count = memory_manager.count("short_term")
         assert count == 3
 
+    def test_count_tracks_writes(self, memory_manager):
+        """Test that the cached count follows overwrites and deletes"""
+        first = memory_manager.store("short_term", "Message 1")
+        second = memory_manager.store("short_term", "Message 2")
+        assert first != second
+
+        memory_manager.store("short_term", "Message 1 edited", key=first)
+        assert memory_manager.count("short_term") == 2
+
+        memory_manager.delete("short_term", first)
+        memory_manager.delete("short_term", first)
+        assert memory_manager.count("short_term") == 1
+
     def test_count_all(self, memory_manager):
         """Test counting all memories"""
         memory_manager.store("short_term", {"content": "Message"}, key="msg_1")
@@ -173,6 +282,19 @@ class TestMemoryManager:
         assert "Message" in json_str
         assert len(json_str) > 0
 
+    def test_export_json_to_file(self, memory_manager, tmp_path):
+        """Test streaming a full export to a file"""
+        memory_manager.store("short_term", {"content": "Message"}, key="msg_1")
+        memory_manager.store("semantic", {"title": "Fact"}, key="fact_1")
+
+        path = tmp_path / "export.json"
+        assert memory_manager.export_json(path=str(path)) is None
+
+        exported = json.loads(path.read_text(encoding="utf-8"))
+        assert exported == json.loads(memory_manager.export_json())
+        assert exported["short_term"][0]["content"] == "Message"
+        assert exported["long_term"] == []
+
     def test_search_cross_memory(self, memory_manager):
         """Test searching across memory types"""
         memory_manager.store("short_term", {"content": "Hello world"}, key="msg_1")
@@ -192,6 +314,13 @@ class TestMemoryManager:
         with pytest.raises(ValueError):
             memory_manager.query("invalid_type")
 
+    def test_memory_types_constant(self, memory_manager):
+        """Test that MEMORY_TYPES lists every available memory type"""
+        assert MemoryManager.MEMORY_TYPES == set(memory_manager.memory_types)
+
+        with pytest.raises(ValueError):
+            memory_manager.export_json("invalid_type")
+
     def test_context_manager(self, temp_db):
         """Test using memory manager as context manager"""
         with MemoryManager(storage_type="sqlite", db_path=temp_db) as memory:
@@ -210,6 +339,20 @@ class TestMemoryTypes:
         recent = memory_manager.short_term.get_recent(limit=3)
         assert len(recent) == 3
 
+    def test_short_term_recent_order(self, memory_manager):
+        """Test that recent messages come newest first, ties by insertion"""
+        for i in range(3):
+            memory_manager.store(
+                "short_term",
+                {"content": f"Message {i}", "timestamp": "2025-01-01T00:00:00"},
+                key=f"msg_{i}",
+            )
+        memory_manager.store("short_term", {"content": "Older", "timestamp": "2024-01-01T00:00:00"})
+
+        recent = memory_manager.short_term.get_recent(limit=3)
+        assert [item["content"] for item in recent] == ["Message 2", "Message 1", "Message 0"]
+        assert memory_manager.list_all("short_term")[:3] == ["msg_0", "msg_1", "msg_2"]
+
     def test_long_term_category(self, memory_manager):
         """Test long-term memory by category"""
         memory_manager.store("long_term", {"title": "AI Fact", "category": "ai"}, key="fact_1")
@@ -232,6 +375,20 @@ class TestMemoryTypes:
         results = memory_manager.episodic.get_by_date_range(start_date, end_date)
         assert len(results) == 1
 
+    def test_episodic_date_range_bounds_and_order(self, memory_manager):
+        """Test episodic date range excludes outside episodes and returns newest first"""
+        for key, timestamp in (
+            ("ep_1", "2025-06-15T10:00:00"),
+            ("ep_2", "2025-03-01T09:00:00"),
+            ("ep_3", "2024-12-31T23:00:00"),
+        ):
+            memory_manager.store("episodic", {"event": key, "timestamp": timestamp}, key=key)
+
+        results = memory_manager.episodic.get_by_date_range(
+            "2025-01-01T00:00:00", "2025-12-31T23:59:59"
+        )
+        assert [ep["event"] for ep in results] == ["ep_1", "ep_2"]
+
     def test_semantic_tags(self, memory_manager):
         """Test semantic memory search by tags"""
         memory_manager.store("semantic", {
@@ -248,5 +405,406 @@ class TestMemoryTypes:
         assert len(results) == 1
 
 
+class TestSQLiteStorage:
+    """Test SQLite backend behaviour"""
+
+    def test_wal_mode(self, memory_manager):
+        """Test that the database runs in WAL mode"""
+        mode = memory_manager.storage.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_reads_see_committed_writes(self, memory_manager):
+        """Test that pooled read connections see writes immediately"""
+        for i in range(10):
+            memory_manager.store("short_term", {"content": f"Message {i}"}, key=f"msg_{i}")
+            assert memory_manager.retrieve("short_term", f"msg_{i}") is not None
+
+    def test_pooled_read_during_batch(self, memory_manager):
+        """Test that reads on other threads run while a batch is open and see committed data"""
+        memory_manager.store("short_term", "Before", key="msg_1")
+        started = threading.Event()
+        finish = threading.Event()
+
+        def write():
+            with memory_manager.batch():
+                memory_manager.store("short_term", "After", key="msg_1")
+                started.set()
+                finish.wait(5)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            assert started.wait(5)
+            assert memory_manager.retrieve("short_term", "msg_1")["content"] == "Before"
+        finally:
+            finish.set()
+            writer.join(5)
+        assert memory_manager.retrieve("short_term", "msg_1")["content"] == "After"
+
+    def test_nested_reads_single_connection(self, temp_db):
+        """Test that a read while holding the only pooled connection does not block"""
+        storage = SQLiteStorage(temp_db, read_connections=1)
+        try:
+            storage.store("notes", "a", {"content": "one"})
+            with storage._with_read():
+                assert storage.list_keys("notes") == ["a"]
+        finally:
+            storage.close()
+
+    def test_reads_while_iterating(self, temp_db):
+        """Test that reads inside a partly consumed iterator do not block"""
+        storage = SQLiteStorage(temp_db, read_connections=1)
+        try:
+            for i in range(3):
+                storage.store("notes", f"k{i}", {"content": f"Note {i}"})
+
+            for key in storage.iter_keys("notes"):
+                assert storage.retrieve("notes", key) is not None
+
+            rows = storage.iter_rows("notes")
+            assert next(rows) == {"content": "Note 0"}
+            assert len(storage.get_all("notes", order_by="timestamp", reverse=True, limit=2)) == 2
+            rows.close()
+        finally:
+            storage.close()
+
+    def test_data_stored_as_json_text(self, memory_manager):
+        """Test that rows are stored as JSON text readable by SQLite's JSON1"""
+        memory_manager.store("short_term", {"content": "Grüße"}, key="msg_1")
+
+        row = memory_manager.storage.conn.execute(
+            "SELECT typeof(data), json_extract(data, '$.content') FROM memory_data"
+        ).fetchone()
+        assert tuple(row) == ("text", "Grüße")
+
+    def test_query_indexed_filters(self, memory_manager):
+        """Test filters on generated columns keep Python equality semantics"""
+        storage = memory_manager.storage
+        storage.store("notes", "a", {"role": "user", "category": "x"})
+        storage.store("notes", "b", {"role": "5"})
+        storage.store("notes", "c", {"role": 5})
+        storage.store("notes", "d", {"role": True})
+        storage.store("notes", "e", {"content": "no role"})
+
+        assert storage.query("notes", {"role": "user", "category": "x"}) == [
+            {"role": "user", "category": "x"}
+        ]
+        assert storage.query("notes", {"role": "5"}) == [{"role": "5"}]
+        assert storage.query("notes", {"role": 1}) == [{"role": True}]
+        assert storage.query("notes", {"role": None}) == [{"content": "no role"}]
+
+    def test_query_without_generated_columns(self, temp_db, monkeypatch):
+        """Test filters still work when SQLite cannot add generated columns"""
+        monkeypatch.setattr(sqlite_backend, "_SQL_ADD_INDEXED_COLUMN", "ALTER TABLE {field}")
+        storage = SQLiteStorage(temp_db)
+        try:
+            assert storage._indexed_fields == ()
+            storage.store("notes", "a", {"role": "user"})
+            storage.store("notes", "b", {"role": "assistant"})
+            assert storage.query("notes", {"role": "user"}) == [{"role": "user"}]
+        finally:
+            storage.close()
+
+    def test_query_raw_json_prefilter(self, memory_manager):
+        """Test string filters pruned on the raw JSON still match exactly"""
+        storage = memory_manager.storage
+        storage.store("notes", "a", {"topic": "50%_off", "content": "sale"})
+        storage.store("notes", "b", {"topic": "50xyoff"})
+        storage.store("notes", "c", {"content": "topic", "note": "50%_off"})
+        storage.store("notes", "d", {"topic": "Grüße"})
+        # Older rows were written with spaces after separators
+        storage.conn.execute(
+            "INSERT INTO memory_data (memory_id, key, data) VALUES (?, ?, ?)",
+            ("notes", "e", '{"topic": "50%_off", "content": "old"}'),
+        )
+        storage.conn.commit()
+
+        assert storage.query("notes", {"topic": "50%_off"}) == [
+            {"topic": "50%_off", "content": "sale"},
+            {"topic": "50%_off", "content": "old"},
+        ]
+        assert storage.query("notes", {"topic": "50%_OFF"}) == []
+        assert storage.query("notes", {"topic": "Grüße"}) == [{"topic": "Grüße"}]
+
+        long_value = "x" * 60000
+        storage.store("notes", "f", {"topic": long_value})
+        assert storage.query("notes", {"topic": long_value}) == [{"topic": long_value}]
+
+    def test_query_contains(self, memory_manager):
+        """Test list membership filtering keeps Python's `in` semantics"""
+        storage = memory_manager.storage
+        storage.store("notes", "a", {"tags": ["ai", "python"]})
+        storage.store("notes", "b", {"tags": ["rust"]})
+        storage.store("notes", "c", {"tags": "ai-research"})
+        storage.store("notes", "d", {"tags": ["go", "rust"]})
+        storage.store("notes", "e", {"content": "untagged"})
+
+        assert storage.query_contains("notes", "tags", ["ai"]) == [
+            {"tags": ["ai", "python"]},
+            {"tags": "ai-research"},
+        ]
+        assert storage.query_contains("notes", "tags", ["rust", "go"]) == [
+            {"tags": ["rust"]},
+            {"tags": ["go", "rust"]},
+        ]
+        assert storage.query_contains("notes", "tags", []) == []
+
+        # NULL never matches in SQL, so None is looked up in Python
+        storage.store("nulls", "a", {"tags": [None, "a"]})
+        storage.store("nulls", "b", {"tags": ["b"]})
+        assert storage.query_contains("nulls", "tags", [None]) == [{"tags": [None, "a"]}]
+
+    def test_search_many_matches_search(self, memory_manager):
+        """Test that one statement over several memories ranks like per-memory searches"""
+        storage = memory_manager.storage
+        for memory_id in ("a", "b"):
+            for i in range(4):
+                storage.store(memory_id, f"k{i}", {"content": "hello " * (i + 1) + "world " * 4})
+        storage.store("c", "k0", {"title": "hello", "content": "other"})
+
+        targets = {"a": None, "b": None, "c": ["content"]}
+        results = storage.search_many("hello", targets, limit=2)
+        for memory_id, fields in targets.items():
+            assert results[memory_id] == storage.search(memory_id, "hello", 2, fields)
+        assert results["c"] == []
+
+    def test_non_finite_floats_stored_as_null(self, memory_manager, monkeypatch):
+        """Test NaN is stored as null with either encoder"""
+        for module in (serialization.orjson, None):
+            monkeypatch.setattr(serialization, "orjson", module)
+            memory_manager.store("short_term", {"score": float("nan")}, key="msg_1")
+            assert memory_manager.retrieve("short_term", "msg_1")["score"] is None
+
+    def test_values_round_trip_with_either_encoder(self, memory_manager, monkeypatch):
+        """Test big integers stay exact and datetimes are stored the same way"""
+        for module in (serialization.orjson, None):
+            monkeypatch.setattr(serialization, "orjson", module)
+            memory_manager.store(
+                "short_term",
+                {"big": 2**70, "low": -2**63 - 1, "when": datetime(2025, 1, 1, 12)},
+                key="msg_1",
+            )
+            item = memory_manager.retrieve("short_term", "msg_1")
+            assert item["big"] == 2**70
+            assert item["low"] == -2**63 - 1 and isinstance(item["low"], int)
+            assert item["when"] == "2025-01-01 12:00:00"
+
+    def test_opens_legacy_database(self, temp_db):
+        """Test a database written before the JSON indexes, holding NaN, still opens"""
+        conn = sqlite3.connect(temp_db)
+        conn.executescript("""
+            CREATE TABLE memories (
+                memory_id TEXT PRIMARY KEY,
+                memory_type TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE memory_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                memory_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(memory_id, key),
+                FOREIGN KEY(memory_id) REFERENCES memories(memory_id)
+            );
+            INSERT INTO memories (memory_id) VALUES ('short_term');
+            INSERT INTO memory_data (memory_id, key, data) VALUES
+                ('short_term', 'msg_0', '{"content": "Legacy hello", "score": NaN}');
+        """)
+        conn.close()
+
+        with MemoryManager(db_path=temp_db) as memory:
+            assert memory.retrieve("short_term", "msg_0") == {"content": "Legacy hello", "score": None}
+            assert len(memory.query("short_term", search_query="legacy")) == 1
+
+    def test_two_managers_share_a_file(self, temp_db):
+        """Test auto keys and counts account for another connection's writes"""
+        with MemoryManager(db_path=temp_db) as m1, MemoryManager(db_path=temp_db) as m2:
+            assert m1.store("short_term", "From m1") == "short_term_0"
+            assert m2.store("short_term", "From m2") == "short_term_1"
+            assert m1.store("short_term", "From m1 again") == "short_term_2"
+            assert m1.count("short_term") == 3
+            assert m2.retrieve("short_term", "short_term_1")["content"] == "From m2"
+
+    def test_external_write_check_blocks_writers(self, temp_db):
+        """Test a write cannot number keys while another thread drops stale counts"""
+        paused = threading.Event()
+        resume = threading.Event()
+
+        class PausingDict(dict):
+            def clear(self):
+                paused.set()
+                resume.wait(5)
+                super().clear()
+
+        with MemoryManager(db_path=temp_db) as m1, MemoryManager(db_path=temp_db) as m2:
+            m1.store("short_term", "m1 first")
+            m2.store("short_term", "m2 first")
+            m1.storage._counts = PausingDict(m1.storage._counts)
+
+            # Called directly, as a reader outside the write lock would
+            checker = threading.Thread(target=m1.storage._check_external_writes)
+            checker.start()
+            assert paused.wait(5)
+
+            keys = []
+            writer = threading.Thread(target=lambda: keys.append(m1.store("short_term", "m1 second")))
+            writer.start()
+            writer.join(0.2)
+            resume.set()
+            checker.join(5)
+            writer.join(5)
+
+            assert keys == ["short_term_2"]
+            assert m2.retrieve("short_term", "short_term_1")["content"] == "m2 first"
+
+    def test_fts_rebuilt_when_outdated(self, temp_db):
+        """Test that an FTS table with an old definition is rebuilt"""
+        with MemoryManager(db_path=temp_db) as memory:
+            memory.store("short_term", {"content": "Running fast"}, key="msg_1")
+            memory.storage.conn.executescript(
+                "DROP TABLE memory_fts; CREATE VIRTUAL TABLE memory_fts USING fts5("
+                "memory_id UNINDEXED, content, title, tags, body);"
+            )
+
+        with MemoryManager(db_path=temp_db) as memory:
+            assert len(memory.query("short_term", search_query="run")) == 1
+
+    def test_store_many(self, memory_manager):
+        """Test storing a batch of items in one transaction"""
+        storage = memory_manager.storage
+        storage.store_many("notes", {f"note_{i}": {"content": f"Note {i}"} for i in range(3)})
+
+        assert storage.list_keys("notes") == ["note_0", "note_1", "note_2"]
+        assert list(storage.iter_keys("notes", batch_size=2)) == ["note_0", "note_1", "note_2"]
+        assert storage.retrieve("notes", "note_1") == {"content": "Note 1"}
+        assert len(storage.search("notes", "note")) == 3
+
+        # Cached count follows a mix of new and existing keys
+        assert storage.count("notes") == 3
+        storage.store_many("notes", {"note_2": {"content": "Updated"}, "note_3": {"content": "New"}})
+        assert storage.count("notes") == 4
+        assert storage.count("notes") == storage.conn.execute(
+            "SELECT COUNT(*) FROM memory_data WHERE memory_id = 'notes'"
+        ).fetchone()[0]
+
+    def test_retrieve_follows_writes(self, memory_manager):
+        """Test that retrieved rows follow writes and are not shared between callers"""
+        storage = memory_manager.storage
+        storage.store("notes", "a", {"content": "one"})
+
+        first = storage.retrieve("notes", "a")
+        first["content"] = "changed"
+        assert storage.retrieve("notes", "a") == {"content": "one"}
+
+        storage.store("notes", "a", {"content": "two"})
+        assert storage.retrieve("notes", "a") == {"content": "two"}
+
+        storage.delete("notes", "a")
+        assert storage.retrieve("notes", "a") is None
+
+    def test_retrieve_sees_other_connections(self, temp_db):
+        """Test rows written by another connection are read back"""
+        with MemoryManager(db_path=temp_db) as m1, MemoryManager(db_path=temp_db) as m2:
+            m1.store("short_term", "Old", key="msg_1")
+            assert m1.retrieve("short_term", "msg_1")["content"] == "Old"
+
+            m2.store("short_term", "New", key="msg_1")
+            assert m1.retrieve("short_term", "msg_1")["content"] == "New"
+            assert m1.query("short_term")[0]["content"] == "New"
+
+    def test_batch_commits_once(self, memory_manager):
+        """Test that writes in a batch are visible inside it and committed together"""
+        with memory_manager.batch():
+            for i in range(4):
+                memory_manager.store("short_term", {"content": f"Message {i}"})
+            assert memory_manager.storage.conn.in_transaction
+            assert memory_manager.retrieve("short_term", "short_term_3") is not None
+
+        assert not memory_manager.storage.conn.in_transaction
+        assert memory_manager.count("short_term") == 4
+
+    def test_batch_rolls_back_on_error(self, memory_manager):
+        """Test that a failing batch leaves no writes behind"""
+        memory_manager.store("short_term", "Kept", key="msg_0")
+
+        with pytest.raises(RuntimeError):
+            with memory_manager.batch():
+                memory_manager.store("short_term", "Discarded", key="msg_1")
+                memory_manager.delete("short_term", "msg_0")
+                raise RuntimeError("abort")
+
+        assert memory_manager.count("short_term") == 1
+        assert memory_manager.list_all("short_term") == ["msg_0"]
+
+    def test_memories_tracked_across_clear_and_rollback(self, memory_manager):
+        """Test that the memories table stays in step with skipped ensure-memory writes"""
+        storage = memory_manager.storage
+        storage.store("notes", "a", {"content": "one"})
+        storage.delete_memory("notes")
+        storage.store("notes", "b", {"content": "two"})
+        assert "notes" in storage.list_memories()
+
+        with pytest.raises(RuntimeError):
+            with storage.batch():
+                storage.store("drafts", "a", {"content": "draft"})
+                raise RuntimeError("abort")
+        assert "drafts" not in storage.list_memories()
+
+        storage.store("drafts", "a", {"content": "draft"})
+        assert "drafts" in storage.list_memories()
+
+
+class TestSimpleRetriever:
+    """Test the in-Python retrieval helpers"""
+
+    def test_filter_by_multiple(self):
+        """Test that every filter must match"""
+        items = [
+            {"role": "user", "lang": "en"},
+            {"role": "user", "lang": "fr"},
+            {"role": "assistant", "lang": "en"},
+        ]
+
+        assert SimpleRetriever.filter_by_multiple(items, {"role": "user", "lang": "en"}) == [items[0]]
+        assert SimpleRetriever.filter_by_multiple(items, {}) == items
+
+    def test_get_recent(self):
+        """Test picking the newest items, including ties and missing timestamps"""
+        items = [
+            {"id": 1, "timestamp": "2025-01-02"},
+            {"id": 2},
+            {"id": 3, "timestamp": "2025-01-03"},
+            {"id": 4, "timestamp": "2025-01-02"},
+        ]
+
+        recent = SimpleRetriever.get_recent(items, limit=3)
+        assert [item["id"] for item in recent] == [3, 1, 4]
+
+    def test_sort_by_field(self):
+        """Test sorting with present, missing and mixed-type fields"""
+        items = [{"n": 2}, {"n": 1}, {"n": 3}]
+        assert [item["n"] for item in SimpleRetriever.sort_by_field(items, "n")] == [1, 2, 3]
+
+        items = [{"n": "b"}, {}, {"n": "a"}]
+        assert SimpleRetriever.sort_by_field(items, "n") == [{}, {"n": "a"}, {"n": "b"}]
+
+        items = [{"n": 1}, {"n": "a"}]
+        assert SimpleRetriever.sort_by_field(items, "n") == items
+
+    def test_search_text(self):
+        """Test case-insensitive search over all or selected fields"""
+        items = [
+            {"content": "Hello World", "tags": ["AI"]},
+            {"content": "Price: $5 (approx.)", "count": 3},
+        ]
+
+        assert SimpleRetriever.search_text(items, "world") == [items[0]]
+        assert SimpleRetriever.search_text(items, "$5 (") == [items[1]]
+        assert SimpleRetriever.search_text(items, "ai", fields=["tags"]) == [items[0]]
+        assert SimpleRetriever.search_text(items, "ai") == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])